@@ -1,7 +1,209 @@
+import asyncio
+from functools import lru_cache
+from itertools import chain, zip_longest
+import logging
+import re
+import sqlite3
+from weakref import WeakValueDictionary
+from aiolimiter import AsyncLimiter
+from cachetools import LRUCache, TTLCache
+from diskcache import Cache
 import httpx
+import msgspec
 from mcp.server.fastmcp import FastMCP, Context
 import os
 
+logger = logging.getLogger(__name__)
+
+# Constants
+SITE_URL = "https://dev.to"
+BASE_URL = f"{SITE_URL}/api"
+PER_PAGE = 10  # Articles shown per listing
+API_KEY = os.environ.get("DEV_TO_API_KEY")
+_AUTH_HEADERS = {"Content-Type": "application/json", "api-key": API_KEY}
+_MISSING_API_KEY = "Error: DEV_TO_API_KEY not set"
+# Per-user location, since the disk cache unpickles whatever it finds there
+CACHE_DIR = os.environ.get("DEV_TO_CACHE_DIR") or os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache"),
+    "devto-mcp",
+)
+
+# Defaults shared by the formatters
+_UNTITLED = "Untitled"
+_UNKNOWN_AUTHOR = "Unknown Author"
+_UNKNOWN_DATE = "Unknown date"
+_NO_DESCRIPTION = "No description available."
+_NO_CONTENT = "No content available."
+_ARTICLES_HEADER = "# Dev.to Articles\n\n"
+_EMPTY_USER: dict = {}  # Shared read-only fallback, never mutated
+
+# Response models for list endpoints, decoded straight from JSON. Dev.to may send null
+# for any of these, so display defaults are applied when rendering, not here.
+
+class ArticleAuthor(msgspec.Struct):
+    name: str | None = None
+    username: str | None = None
+
+class Article(msgspec.Struct):
+    id: int | str | None = None
+    title: str | None = None
+    description: str | None = None
+    readable_publish_date: str | None = None
+    tags: str | None = None
+    url: str | None = None
+    user: ArticleAuthor | None = None
+
+class SearchResults(msgspec.Struct):
+    result: list[Article] = []
+
+_JSON_DECODER = msgspec.json.Decoder()
+_ARTICLES_DECODER = msgspec.json.Decoder(list[Article])
+_SEARCH_DECODER = msgspec.json.Decoder(SearchResults)
+
+# Shared HTTP client, created lazily on first use and closed when the process exits
+_client: httpx.AsyncClient | None = None
+_client_lock = asyncio.Lock()
+
+async def get_client() -> httpx.AsyncClient:
+    """Return the shared Dev.to HTTP client, creating it on first use"""
+    global _client
+    if _client is None:
+        async with _client_lock:
+            if _client is None:
+                # Long-lived keep-alive connections skip repeat DNS lookups and handshakes;
+                # the transport retries failed connection attempts
+                transport = httpx.AsyncHTTPTransport(
+                    http2=True,
+                    limits=httpx.Limits(
+                        max_connections=50,
+                        max_keepalive_connections=20,
+                        keepalive_expiry=300,
+                    ),
+                    retries=3,
+                )
+                _client = httpx.AsyncClient(transport=transport, timeout=10.0)
+    return _client
+
+async def close_client() -> None:
+    """Close the shared HTTP client if it was created"""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+# Client-side pacing so bursts of tool calls stay under Dev.to's rate limit
+_rate_limiter = AsyncLimiter(30, 1)
+# Longest Retry-After we will wait out before giving up on a 429
+_MAX_RETRY_AFTER = 10
+
+def _retry_after(response: httpx.Response) -> float | None:
+    """Seconds to wait before retrying a 429, or None if it is too long to wait"""
+    try:
+        delay = float(response.headers.get("Retry-After", "1"))
+    except ValueError:
+        delay = 1.0
+    return delay if delay <= _MAX_RETRY_AFTER else None
+
+async def send_request(method: str, url: str, **kwargs) -> httpx.Response:
+    """Send a paced request to Dev.to, retrying once after a 429"""
+    client = await get_client()
+    send = getattr(client, method)
+    async with _rate_limiter:
+        response = await send(url, **kwargs)
+    if response.status_code == 429:
+        delay = _retry_after(response)
+        if delay is not None:
+            await asyncio.sleep(delay)
+            async with _rate_limiter:
+                response = await send(url, **kwargs)
+    response.raise_for_status()
+    return response
+
+# Response caches for GET endpoints, keyed by _cache_key().
+# "short" suits fast-moving feeds, "long" suits rarely-changing profiles.
+_CACHE = {
+    "short": TTLCache(maxsize=512, ttl=10),
+    "normal": TTLCache(maxsize=512, ttl=30),
+    "long": TTLCache(maxsize=256, ttl=300),
+}
+# Last good response per key, served if Dev.to is unreachable
+_STALE = LRUCache(maxsize=1024)
+# One lock per in-flight key so concurrent misses share a single request
+_fetch_locks: WeakValueDictionary = WeakValueDictionary()
+_MISSING = object()
+# Raw response bodies persisted under CACHE_DIR so a restarted server starts warm.
+# This tier is optional: if it can't be opened it stays off and lookups go memory -> network.
+_disk: Cache | None = None
+_disk_disabled = False
+
+def get_disk_cache() -> Cache | None:
+    """Return the on-disk response cache, or None if it is unavailable"""
+    global _disk, _disk_disabled
+    if _disk is None and not _disk_disabled:
+        try:
+            os.makedirs(CACHE_DIR, mode=0o700, exist_ok=True)
+            if hasattr(os, "getuid") and os.stat(CACHE_DIR).st_uid != os.getuid():
+                raise PermissionError(f"{CACHE_DIR} is owned by another user")
+            _disk = Cache(CACHE_DIR)
+        except (OSError, sqlite3.Error) as e:
+            _disk_disabled = True
+            logger.warning("Disk cache disabled, could not open %s: %s", CACHE_DIR, e)
+    return _disk
+
+def _disk_call(method: str, *args, **kwargs):
+    """Run a disk cache operation, treating storage errors (or no disk cache) as a miss"""
+    disk = get_disk_cache()
+    if disk is None:
+        return None
+    try:
+        return getattr(disk, method)(*args, **kwargs)
+    except (OSError, sqlite3.Error) as e:
+        logger.debug("Disk cache %s failed: %s", method, e)
+        return None
+
+def purge_disk_cache() -> None:
+    """Remove expired disk entries; done once at startup to keep the scan off the request path"""
+    _disk_call("expire")
+
+def close_disk_cache() -> None:
+    """Close the on-disk response cache if it was opened"""
+    global _disk
+    if _disk is not None:
+        _disk.close()
+        _disk = None
+
+def _cache_key(path: str, params: dict = None, base_url: str = BASE_URL,
+               decoder: msgspec.json.Decoder = _JSON_DECODER) -> tuple:
+    """Cache key for a GET; the decoded type is part of it so callers never get another shape back"""
+    return (path, tuple(sorted((params or {}).items())), base_url, str(decoder.type))
+
+def clear_cache() -> None:
+    """Drop every cached API response"""
+    for cache in _CACHE.values():
+        cache.clear()
+    _STALE.clear()
+    if _disk is not None:
+        _disk.clear()
+
+def invalidate_cache(path: str) -> None:
+    """
+    Drop cached responses for a path so the next read is fresh
+
+    On disk only the plain, parameterless entry is removed, which is the only one the
+    single-article tools create; scanning every disk key would block the event loop.
+    """
+    for cache in (*_CACHE.values(), _STALE):
+        for key in [key for key in cache if key[0] == path]:
+            cache.pop(key, None)
+    _disk_call("delete", _cache_key(path))
+
+def _can_serve_stale(error: httpx.HTTPError) -> bool:
+    """Stale data is only a stand-in for outages and rate limits, not for 4xx answers"""
+    if isinstance(error, httpx.HTTPStatusError):
+        status = error.response.status_code
+        return status == 429 or status >= 500
+    return True
+
 # Create a Dev.to MCP server
 mcp = FastMCP(
     "Dev.to API", 
@@ -18,16 +220,21 @@ mcp = FastMCP(
     - `search_articles(query, page=1)` - Search for articles by keywords in title/description
     - `get_article_details(article_id)` - Get full content and metadata for a specific article
     - `get_articles_by_username(username)` - Get articles written by a specific author
+    - `get_articles_by_tags(tags)` - Get articles for several tags at once
+    - `get_articles_by_usernames(usernames)` - Get articles for several authors at once
     - `create_article(title, body_markdown, tags, published)` - Create and publish a new article
     - `update_article(article_id, title, body_markdown, tags, published)` - Update an existing article
     - `get_user_info(username)` - Get information about a Dev.to user
     
+    List and detail tools return structured data; pass `pretty=True` for formatted markdown.
+    
     ## When to use what
     - For browsing recent content: Use `get_latest_articles()` 
     - For popular content: Use `get_top_articles()`
     - For articles on specific topics: Use `get_articles_by_tag(tag)` with the tag name
     - For searching by keywords: Use `search_articles(query)`
     - For author-specific content: Use `get_articles_by_username(username)`
+    - For several tags or authors at once: Use `get_articles_by_tags(tags)` or `get_articles_by_usernames(usernames)`
     - For full article content: Use `get_article_details(article_id)` or `get_article_by_id(id)`
     - For publishing new content: Use `create_article(title, body_markdown, tags, published)`
     - For updating existing content: Use `update_article(article_id, title, body_markdown, tags, published)`
@@ -52,98 +259,204 @@ mcp = FastMCP(
     """
 )
 
-# Constants
-BASE_URL = "https://dev.to/api"
-
 # Helper functions
-async def fetch_from_api(path: str, params: dict = None) -> dict:
-    """Helper function to fetch data from Dev.to API"""
-    async with httpx.AsyncClient() as client:
-        url = f"{BASE_URL}{path}"
-        response = await client.get(url, params=params, timeout=10.0)
-        response.raise_for_status()
-        return response.json()
+async def fetch_from_api(path: str, params: dict = None, policy: str = "normal",
+                         base_url: str = BASE_URL, decoder: msgspec.json.Decoder = _JSON_DECODER):
+    """
+    Helper function to fetch data from Dev.to API, cached for the TTL of `policy`
+    
+    Lookups go memory cache -> disk cache -> network, and a network hit fills both caches.
+    """
+    cache = _CACHE[policy]
+    key = _cache_key(path, params, base_url, decoder)
+    data = cache.get(key, _MISSING)
+    if data is not _MISSING:
+        return data
+
+    lock = _fetch_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        data = cache.get(key, _MISSING)
+        if data is not _MISSING:
+            return data
+
+        raw = _disk_call("get", key)
+        if raw is not None:
+            try:
+                data = decoder.decode(raw)
+            except msgspec.DecodeError:
+                _disk_call("delete", key)
+            else:
+                cache[key] = _STALE[key] = data
+                return data
+
+        try:
+            response = await send_request("get", f"{base_url}{path}", params=params)
+            raw = response.content
+            data = decoder.decode(raw)
+        except httpx.HTTPError as e:
+            if key in _STALE and _can_serve_stale(e):
+                return _STALE[key]
+            raise
+        cache[key] = _STALE[key] = data
+        _disk_call("set", key, raw, expire=cache.ttl)
+        return data
+
+def normalize_query(query: str) -> str:
+    """Lowercase a search query and collapse its whitespace so trivially different spellings share a cache entry"""
+    return " ".join(query.lower().split())
+
+@lru_cache(maxsize=64)
+def compile_query(query: str):
+    """Case-insensitive matcher for a literal query, reused across repeated searches"""
+    return re.compile(re.escape(query), re.IGNORECASE).search
+
+def merge_article_pages(pages: list[list[Article]], limit: int = 20) -> list[Article]:
+    """Interleave pages round-robin so every page is represented, skipping articles already seen"""
+    merged = []
+    seen = set()
+    for article in chain.from_iterable(zip_longest(*pages)):
+        if article is None or (article.id is not None and article.id in seen):
+            continue
+        seen.add(article.id)
+        merged.append(article)
+        if len(merged) == limit:
+            break
+    return merged
+
+def normalize_tag(tag: str) -> str:
+    """Dev.to tags are lowercase without a leading #"""
+    return tag.strip().lstrip("#").lower()
 
 # Resources
 
 @mcp.tool()
-async def get_latest_articles() -> str:
+async def get_latest_articles(pretty: bool = False) -> list[dict] | str:
     """Get the latest articles from Dev.to"""
-    articles = await fetch_from_api("/articles/latest")
-    return format_articles(articles[:10])  # Limiting to 10 for readability
+    articles = await fetch_from_api("/articles/latest", params={"per_page": PER_PAGE}, policy="short",
+                                    decoder=_ARTICLES_DECODER)
+    return render_articles(articles, pretty)
     
 @mcp.tool()
-async def get_top_articles() -> str:
+async def get_top_articles(pretty: bool = False) -> list[dict] | str:
     """Get the top articles from Dev.to"""
-    articles = await fetch_from_api("/articles")
-    return format_articles(articles[:10])  # Limiting to 10 for readability
+    articles = await fetch_from_api("/articles", params={"per_page": PER_PAGE}, decoder=_ARTICLES_DECODER)
+    return render_articles(articles, pretty)
 
 @mcp.tool()
-async def get_articles_by_tag(tag: str) -> str:
+async def get_articles_by_tag(tag: str, pretty: bool = False) -> list[dict] | str:
     """Get articles by tag from Dev.to"""
-    articles = await fetch_from_api("/articles", params={"tag": tag})
-    return format_articles(articles[:10])  # Limiting to 10 for readability
+    articles = await fetch_from_api("/articles", params={"tag": normalize_tag(tag), "per_page": PER_PAGE},
+                                    decoder=_ARTICLES_DECODER)
+    return render_articles(articles, pretty)
 
 @mcp.tool()
-async def get_article_by_id(id: str) -> str:
+async def get_article_by_id(id: str, pretty: bool = False) -> dict | str:
     """Get a specific article by ID from Dev.to"""
     article = await fetch_from_api(f"/articles/{id}")
-    return format_article_details(article)
+    return render_article_details(article, pretty)
 
 # Tools
 
 @mcp.tool()
-async def search_articles(query: str, page: int = 1) -> str:
+async def search_articles(query: str, page: int = 1, pretty: bool = False) -> list[dict] | str:
     """
     Search for articles on Dev.to
     
     Args:
         query: Search term to find articles
         page: Page number for pagination (default: 1)
+        pretty: Return formatted markdown instead of structured data (default: False)
     """
-    articles = await fetch_from_api("/articles", params={"page": page})
-    
-    filtered_articles = [
-        article for article in articles 
-        if query.lower() in article.get("title", "").lower() or 
-           query.lower() in article.get("description", "").lower()
-    ]
-    
-    return format_articles(filtered_articles[:10])
+    query = normalize_query(query)
+    try:
+        results = await fetch_from_api(
+            "/search/feed_content",
+            params={"per_page": PER_PAGE, "page": page, "class_name": "Article", "search_fields": query},
+            policy="long",
+            base_url=SITE_URL,
+            decoder=_SEARCH_DECODER,
+        )
+        return render_articles(results.result[:PER_PAGE], pretty)
+    except (httpx.HTTPError, msgspec.DecodeError):
+        # The search endpoint is not part of the public API; fall back to filtering a page
+        pass
+
+    # Fetch a full page since most of it will be filtered out
+    articles = await fetch_from_api("/articles", params={"page": page, "per_page": 30}, decoder=_ARTICLES_DECODER)
+
+    matches = compile_query(query)
+    filtered_articles = []
+    for article in articles:
+        if matches(article.title or "") or matches(article.description or ""):
+            filtered_articles.append(article)
+            if len(filtered_articles) == PER_PAGE:
+                break
+
+    return render_articles(filtered_articles, pretty)
 
 @mcp.tool()
-async def get_article_details(article_id: int) -> str:
+async def get_article_details(article_id: int, pretty: bool = False) -> dict | str:
     """
     Get detailed information about a specific article
     
     Args:
         article_id: The ID of the article to retrieve
+        pretty: Return formatted markdown instead of structured data (default: False)
     """
     article = await fetch_from_api(f"/articles/{article_id}")
-    return format_article_details(article)
+    return render_article_details(article, pretty)
 
 @mcp.tool()
-async def get_articles_by_username(username: str) -> str:
+async def get_articles_by_username(username: str, pretty: bool = False) -> list[dict] | str:
     """
     Get articles written by a specific user
     
     Args:
         username: The username of the author
+        pretty: Return formatted markdown instead of structured data (default: False)
+    """
+    articles = await fetch_from_api("/articles", params={"username": username, "per_page": PER_PAGE},
+                                    decoder=_ARTICLES_DECODER)
+    return render_articles(articles, pretty)
+
+@mcp.tool()
+async def get_articles_by_tags(tags: list[str], pretty: bool = False) -> list[dict] | str:
+    """
+    Get articles for several tags at once, fetched concurrently
+    
+    Args:
+        tags: The tag names to look up (e.g., ["python", "rust", "go"])
+        pretty: Return formatted markdown instead of structured data (default: False)
     """
-    articles = await fetch_from_api("/articles", params={"username": username})
-    return format_articles(articles[:10])
+    results = await asyncio.gather(*(fetch_from_api("/articles", params={"tag": normalize_tag(tag), "per_page": PER_PAGE},
+                                              decoder=_ARTICLES_DECODER) for tag in tags))
+    return render_articles(merge_article_pages(results), pretty)
 
 @mcp.tool()
-async def get_user_info(username: str) -> str:
+async def get_articles_by_usernames(usernames: list[str], pretty: bool = False) -> list[dict] | str:
+    """
+    Get articles written by several users at once, fetched concurrently
+    
+    Args:
+        usernames: The usernames of the authors
+        pretty: Return formatted markdown instead of structured data (default: False)
+    """
+    results = await asyncio.gather(*(fetch_from_api("/articles", params={"username": username, "per_page": PER_PAGE},
+                                              decoder=_ARTICLES_DECODER) for username in usernames))
+    return render_articles(merge_article_pages(results), pretty)
+
+@mcp.tool()
+async def get_user_info(username: str, pretty: bool = False) -> dict | str:
     """
     Get information about a Dev.to user
     
     Args:
         username: The username of the user
+        pretty: Return formatted markdown instead of structured data (default: False)
     """
     try:
-        user = await fetch_from_api(f"/users/{username}")
-        return format_user_profile(user)
+        user = await fetch_from_api(f"/users/{username}", policy="long")
+        return render_user_profile(user, pretty)
     except httpx.HTTPStatusError as e:
         if e.response.status_code == 404:
             return f"User {username} not found."
@@ -160,6 +473,9 @@ async def create_article(title: str, body_markdown: str, tags: str = "", publish
         tags: Comma-separated list of tags (e.g., "python,tutorial,webdev")
         published: Whether to publish immediately (True) or save as draft (False)
     """
+    if not API_KEY:
+        return _MISSING_API_KEY
+
     article_data = {
         "article": {
             "title": title,
@@ -169,11 +485,9 @@ async def create_article(title: str, body_markdown: str, tags: str = "", publish
         }
     }
     
-    async with httpx.AsyncClient() as client:
-        response = await client.post(f"{BASE_URL}/articles", json=article_data, headers={"Content-Type": "application/json", "api-key": os.getenv("DEV_TO_API_KEY")}, timeout=10.0)
-        response.raise_for_status()
-        article = response.json()
-        
+    response = await send_request("post", f"{BASE_URL}/articles", json=article_data, headers=_AUTH_HEADERS)
+    article = _JSON_DECODER.decode(response.content)
+
     return f"Article created successfully with ID: {article.get('id')}\nURL: {article.get('url')}"
 
 @mcp.tool()
@@ -189,9 +503,9 @@ async def update_article(article_id: int, title: str = None, body_markdown: str
         tags: New comma-separated list of tags (optional)
         published: Change publish status (optional)
     """
-    # First get the current article data
-    article = await fetch_from_api(f"/articles/{article_id}")
-    
+    if not API_KEY:
+        return _MISSING_API_KEY
+
     # Prepare update data with only the fields that are provided
     update_data = {"article": {}}
     if title is not None:
@@ -203,11 +517,10 @@ async def update_article(article_id: int, title: str = None, body_markdown: str
     if published is not None:
         update_data["article"]["published"] = published
     
-    async with httpx.AsyncClient() as client:
-        response = await client.put(f"{BASE_URL}/articles/{article_id}", json=update_data, timeout=10.0)
-        response.raise_for_status()
-        updated_article = response.json()
-    
+    response = await send_request("put", f"{BASE_URL}/articles/{article_id}", json=update_data, headers=_AUTH_HEADERS)
+    updated_article = _JSON_DECODER.decode(response.content)
+    invalidate_cache(f"/articles/{article_id}")
+
     return f"Article updated successfully\nURL: {updated_article.get('url')}"
 
 # Prompts
@@ -224,47 +537,103 @@ def analyze_article(article_id: str) -> str:
 
 # Helper formatting functions
 
-def format_articles(articles: list) -> str:
+def _or_default(value, default):
+    """Fall back to `default` for fields that are missing or null"""
+    return default if value is None else value
+
+def summarize_article(article: Article) -> dict:
+    """Keep the article fields worth returning to a client, with display defaults applied"""
+    author = article.user.name if article.user is not None else None
+    return {
+        "id": _or_default(article.id, ""),
+        "title": _or_default(article.title, _UNTITLED),
+        "author": _or_default(author, _UNKNOWN_AUTHOR),
+        "published": _or_default(article.readable_publish_date, _UNKNOWN_DATE),
+        "tags": _or_default(article.tags, ""),
+        "description": _or_default(article.description, _NO_DESCRIPTION),
+        "url": _or_default(article.url, ""),
+    }
+
+def summarize_user(user: dict) -> dict:
+    """Keep the profile fields worth returning to a client"""
+    return {
+        "username": user.get("username"),
+        "name": user.get("name"),
+        "bio": user.get("summary"),
+        "location": user.get("location"),
+        "joined": user.get("joined_at"),
+        "twitter": user.get("twitter_username"),
+        "github": user.get("github_username"),
+        "website": user.get("website_url"),
+    }
+
+def render_articles(articles: list[Article], pretty: bool) -> list[dict] | str:
+    """Return articles as structured data, or as markdown if `pretty`"""
+    if pretty:
+        return format_articles(articles)
+    return [summarize_article(article) for article in articles]
+
+def summarize_article_details(article: dict) -> dict:
+    """Keep the fields of a full article, with display defaults for missing or null values"""
+    author = (article.get("user") or _EMPTY_USER).get("name")
+    return {
+        "id": _or_default(article.get("id"), ""),
+        "title": _or_default(article.get("title"), _UNTITLED),
+        "author": _or_default(author, _UNKNOWN_AUTHOR),
+        "published": _or_default(article.get("readable_publish_date"), _UNKNOWN_DATE),
+        "tags": _or_default(article.get("tags"), ""),
+        "description": _or_default(article.get("description"), _NO_DESCRIPTION),
+        "url": _or_default(article.get("url"), ""),
+        "body_markdown": _or_default(article.get("body_markdown"), _NO_CONTENT),
+    }
+
+def render_article_details(article: dict, pretty: bool) -> dict | str:
+    """Return a full article as structured data, or as markdown if `pretty`"""
+    if pretty:
+        return format_article_details(article)
+    return summarize_article_details(article)
+
+def render_user_profile(user: dict, pretty: bool) -> dict | str:
+    """Return a user profile as structured data, or as markdown if `pretty`"""
+    if pretty:
+        return format_user_profile(user)
+    return summarize_user(user)
+
+_ARTICLE_TEMPLATE = (
+    "## {title}\n"
+    "ID: {id}\n"
+    "Author: {author}\n"
+    "Published: {published}\n"
+    "Tags: {tags}\n"
+    "Description: {description}\n\n"
+).format_map
+
+def format_articles(articles: list[Article]) -> str:
     """Format a list of articles for display"""
     if not articles:
         return "No articles found."
     
-    result = "# Dev.to Articles\n\n"
+    parts = [_ARTICLES_HEADER]
     for article in articles:
-        title = article.get("title", "Untitled")
-        author = article.get("user", {}).get("name", "Unknown Author")
-        published_date = article.get("readable_publish_date", "Unknown date")
-        article_id = article.get("id", "")
-        tags = article.get("tags", "")
-        
-        result += f"## {title}\n"
-        result += f"ID: {article_id}\n"
-        result += f"Author: {author}\n"
-        result += f"Published: {published_date}\n"
-        result += f"Tags: {tags}\n"
-        result += f"Description: {article.get('description', 'No description available.')}\n\n"
+        parts.append(_ARTICLE_TEMPLATE(summarize_article(article)))
     
-    return result
+    return "".join(parts)
 
 def format_article_details(article: dict) -> str:
     """Format a single article with full details"""
     if not article:
         return "Article not found."
     
-    title = article.get("title", "Untitled")
-    author = article.get("user", {}).get("name", "Unknown Author")
-    published_date = article.get("readable_publish_date", "Unknown date")
-    body = article.get("body_markdown", "No content available.")
-    tags = article.get("tags", "")
-    
-    result = f"# {title}\n\n"
-    result += f"Author: {author}\n"
-    result += f"Published: {published_date}\n"
-    result += f"Tags: {tags}\n\n"
-    result += "## Content\n\n"
-    result += body
+    details = summarize_article_details(article)
     
-    return result
+    return (
+        f"# {details['title']}\n\n"
+        f"Author: {details['author']}\n"
+        f"Published: {details['published']}\n"
+        f"Tags: {details['tags']}\n\n"
+        "## Content\n\n"
+        f"{details['body_markdown']}"
+    )
 
 def format_user_profile(user: dict) -> str:
     """Format a user profile for display"""
@@ -280,26 +649,37 @@ def format_user_profile(user: dict) -> str:
     location = user.get("location", "")
     joined = user.get("joined_at", "")
     
-    result = f"# {name} (@{username})\n\n"
-    result += f"Bio: {bio}\n\n"
-    
-    result += "## Details\n"
+    parts = [f"# {name} (@{username})\n\nBio: {bio}\n\n## Details\n"]
     if location:
-        result += f"Location: {location}\n"
+        parts.append(f"Location: {location}\n")
     if joined:
-        result += f"Member since: {joined}\n"
+        parts.append(f"Member since: {joined}\n")
     
-    result += "\n## Links\n"
+    parts.append("\n## Links\n")
     if twitter:
-        result += f"Twitter: @{twitter}\n"
+        parts.append(f"Twitter: @{twitter}\n")
     if github:
-        result += f"GitHub: {github}\n"
+        parts.append(f"GitHub: {github}\n")
     if website:
-        result += f"Website: {website}\n"
+        parts.append(f"Website: {website}\n")
     
-    return result
+    return "".join(parts)
+
+async def main() -> None:
+    """
+    Serve over stdio, closing shared resources once the server exits
+
+    The client and disk cache are shared by every session, so they are closed here rather
+    than in a FastMCP lifespan hook, which runs once per session.
+    """
+    purge_disk_cache()
+    try:
+        await mcp.run_stdio_async()
+    finally:
+        await close_client()
+        close_disk_cache()
 
 
 if __name__ == "__main__":
     print("Starting Dev.to MCP server...")
-    mcp.run() 
\ No newline at end of file
+    asyncio.run(main()) 
\ No newline at end of file
@@ -1,6 +1,10 @@
 import pytest
 from unittest.mock import Mock, AsyncMock
-import httpx
+from aiolimiter import AsyncLimiter
+from diskcache import Cache
+from mcp_py_devto import server
+
+pytest_plugins = ("pytest_asyncio",)
 
 @pytest.fixture
 def mock_response():
@@ -9,15 +13,33 @@ def mock_response():
     response.raise_for_status = Mock()
     return response
 
+@pytest.fixture(scope="session")
+def mock_httpx_client():
+    # Shared for the whole session, like the pooled client in production
+    return AsyncMock()
+
+@pytest.fixture(autouse=True)
+def reset_httpx_client(monkeypatch, mock_httpx_client, mock_response):
+    mock_httpx_client.reset_mock(side_effect=True)
+    mock_httpx_client.get.return_value = mock_response
+    mock_httpx_client.post.return_value = mock_response
+    mock_httpx_client.put.return_value = mock_response
+
+    monkeypatch.setattr(server, "_client", mock_httpx_client)
+    # Fresh limiter so pacing in one test never delays the next
+    monkeypatch.setattr(server, "_rate_limiter", AsyncLimiter(30, 1))
+
+@pytest.fixture(autouse=True)
+def clear_api_cache(monkeypatch, tmp_path):
+    # Keep the disk tier out of the user's real cache directory
+    monkeypatch.setattr(server, "_disk", Cache(str(tmp_path / "cache")))
+    server.clear_cache()
+    yield
+    server.clear_cache()
+    server.close_disk_cache()
+
 @pytest.fixture
-def mock_httpx_client(monkeypatch, mock_response):
-    client = AsyncMock()
-    client.get.return_value = mock_response
-    client.post.return_value = mock_response
-    client.put.return_value = mock_response
-    
-    async def mock_context_manager(*args, **kwargs):
-        return client
-        
-    monkeypatch.setattr(httpx, "AsyncClient", Mock(return_value=AsyncMock(__aenter__=mock_context_manager)))
-    return client
+def api_key(monkeypatch):
+    monkeypatch.setattr(server, "API_KEY", "test-key")
+    monkeypatch.setattr(server, "_AUTH_HEADERS", {"Content-Type": "application/json", "api-key": "test-key"})
+    return "test-key"
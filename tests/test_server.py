@@ -1,13 +1,21 @@
+import asyncio
 import pytest
 import httpx
-from unittest.mock import Mock, patch
+import msgspec
+from unittest.mock import Mock, PropertyMock, patch
+from mcp_py_devto import server
 from mcp_py_devto.server import (
     get_latest_articles,
     get_top_articles,
     get_articles_by_tag,
+    get_articles_by_tags,
+    get_articles_by_usernames,
     get_article_by_id,
     search_articles,
     get_user_info,
+    create_article,
+    update_article,
+    Article,
     format_articles,
     format_article_details,
     format_user_profile
@@ -39,40 +47,149 @@ def mock_user():
     }
 
 async def test_get_latest_articles(mock_httpx_client, mock_article):
-    mock_httpx_client.get.return_value.json.return_value = [mock_article]
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
     result = await get_latest_articles()
+    assert result[0]["title"] == "Test Article"
+    assert result[0]["author"] == "Test Author"
+
+async def test_get_latest_articles_pretty(mock_httpx_client, mock_article):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
+    result = await get_latest_articles(pretty=True)
     assert "Test Article" in result
     assert "Test Author" in result
 
 async def test_get_top_articles(mock_httpx_client, mock_article):
-    mock_httpx_client.get.return_value.json.return_value = [mock_article]
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
     result = await get_top_articles()
-    assert "Test Article" in result
+    assert result[0]["title"] == "Test Article"
 
 async def test_get_articles_by_tag(mock_httpx_client, mock_article):
-    mock_httpx_client.get.return_value.json.return_value = [mock_article]
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
     result = await get_articles_by_tag("python")
-    assert "Test Article" in result
+    assert result[0]["title"] == "Test Article"
+
+async def test_get_top_articles_tolerates_null_fields(mock_httpx_client, mock_article):
+    article = dict(mock_article, description=None, user=None, readable_publish_date=None)
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([article])
+    result = await get_top_articles()
+    assert result[0]["title"] == "Test Article"
+    assert result[0]["description"] == "No description available."
+    assert result[0]["author"] == "Unknown Author"
+    assert "Published: Unknown date" in await get_top_articles(pretty=True)
+
+async def test_get_articles_by_tags(mock_httpx_client, mock_article):
+    def page_for(tag, count, start):
+        return [dict(mock_article, id=start + i, title=f"{tag} {i}") for i in range(count)]
+
+    shared = dict(mock_article, id=999, title="Python and Rust")
+    pages = {
+        "python": [shared, *page_for("python", 9, 100)],
+        "rust": [shared, *page_for("rust", 9, 200)],
+        "go": page_for("go", 10, 300),
+    }
+
+    def respond(url, params=None, **kwargs):
+        return Mock(status_code=200, content=msgspec.json.encode(pages[params["tag"]]))
+
+    mock_httpx_client.get.side_effect = respond
+    result = await get_articles_by_tags(["python", "rust", "go"])
+    titles = [article["title"] for article in result]
+    assert len(titles) == 20
+    assert titles.count("Python and Rust") == 1
+    assert any(title.startswith("go ") for title in titles)
+    assert titles[:4] == ["Python and Rust", "go 0", "python 0", "rust 0"]
+
+async def test_get_articles_by_usernames(mock_httpx_client, mock_article):
+    def respond(url, params=None, **kwargs):
+        article = dict(mock_article, id=params["username"], title=f"By {params['username']}")
+        return Mock(status_code=200, content=msgspec.json.encode([article]))
+
+    mock_httpx_client.get.side_effect = respond
+    result = await get_articles_by_usernames(["ben", "jess"])
+    assert [article["title"] for article in result] == ["By ben", "By jess"]
 
 async def test_get_article_by_id(mock_httpx_client, mock_article):
-    mock_httpx_client.get.return_value.json.return_value = mock_article
+    mock_httpx_client.get.return_value.content = msgspec.json.encode(mock_article)
     result = await get_article_by_id("123")
+    assert result["title"] == "Test Article"
+    assert result["body_markdown"] == "Test content"
+
+async def test_get_article_by_id_pretty(mock_httpx_client, mock_article):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode(mock_article)
+    result = await get_article_by_id("123", pretty=True)
     assert "Test Article" in result
     assert "Test content" in result
 
+async def test_get_article_by_id_tolerates_null_fields(mock_httpx_client, mock_article):
+    article = dict(mock_article, user=None, body_markdown=None)
+    mock_httpx_client.get.return_value.content = msgspec.json.encode(article)
+    result = await get_article_by_id("123")
+    assert result["author"] == "Unknown Author"
+    assert result["body_markdown"] == "No content available."
+    pretty = await get_article_by_id("123", pretty=True)
+    assert "Author: Unknown Author" in pretty
+
 async def test_search_articles(mock_httpx_client, mock_article):
-    mock_httpx_client.get.return_value.json.return_value = [mock_article]
+    mock_httpx_client.get.return_value.content = msgspec.json.encode({"result": [mock_article]})
     result = await search_articles("test")
-    assert "Test Article" in result
+    assert result[0]["title"] == "Test Article"
+    assert mock_httpx_client.get.call_count == 1
+
+async def test_search_articles_shares_cache_across_spellings(mock_httpx_client, mock_article):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode({"result": [mock_article]})
+    await search_articles("POST requests")
+    result = await search_articles("  post   Requests ")
+    assert result[0]["title"] == "Test Article"
+    assert mock_httpx_client.get.call_count == 1
+    assert mock_httpx_client.get.call_args.kwargs["params"]["search_fields"] == "post requests"
+
+async def test_get_articles_by_tag_normalizes_tag(mock_httpx_client, mock_article):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
+    await get_articles_by_tag("python")
+    await get_articles_by_tag("#Python")
+    assert mock_httpx_client.get.call_count == 1
+
+async def test_search_articles_falls_back_to_filter(mock_httpx_client, mock_article):
+    other = dict(mock_article, title="Unrelated", description="Nothing here")
+    type(mock_httpx_client.get.return_value).content = PropertyMock(side_effect=[
+        b"<html>not json</html>",
+        msgspec.json.encode([other, mock_article]),
+    ])
+    result = await search_articles("TEST")
+    assert [article["title"] for article in result] == ["Test Article"]
+
+async def test_search_articles_fallback_keeps_phrase(mock_httpx_client, mock_article):
+    article = dict(mock_article, title="Handling errors in Python")
+    type(mock_httpx_client.get.return_value).content = PropertyMock(side_effect=[
+        b"<html>not json</html>",
+        msgspec.json.encode([article]),
+    ])
+    result = await search_articles("errors in python")
+    assert [article["title"] for article in result] == ["Handling errors in Python"]
+
+async def test_search_articles_fallback_keeps_non_ascii_query(mock_httpx_client, mock_article):
+    article = dict(mock_article, title="Straße in Berlin")
+    type(mock_httpx_client.get.return_value).content = PropertyMock(side_effect=[
+        b"<html>not json</html>",
+        msgspec.json.encode([article]),
+    ])
+    result = await search_articles("Straße")
+    assert [article["title"] for article in result] == ["Straße in Berlin"]
 
 async def test_get_user_info(mock_httpx_client, mock_user):
-    mock_httpx_client.get.return_value.json.return_value = mock_user
+    mock_httpx_client.get.return_value.content = msgspec.json.encode(mock_user)
     result = await get_user_info("testuser")
+    assert result["name"] == "Test User"
+    assert result["location"] == "Test Location"
+
+async def test_get_user_info_pretty(mock_httpx_client, mock_user):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode(mock_user)
+    result = await get_user_info("testuser", pretty=True)
     assert "Test User" in result
     assert "Test Location" in result
 
 def test_format_articles(mock_article):
-    result = format_articles([mock_article])
+    result = format_articles([msgspec.convert(mock_article, Article)])
     assert "Test Article" in result
     assert "Test Author" in result
     assert "Test description" in result
@@ -87,3 +204,142 @@ def test_format_user_profile(mock_user):
     assert "Test User" in result
     assert "Test Location" in result
     assert "testtwitter" in result
+
+async def test_get_client_is_reused(monkeypatch):
+    monkeypatch.setattr(server, "_client", None)
+    client = await server.get_client()
+    try:
+        assert await server.get_client() is client
+    finally:
+        await server.close_client()
+    assert server._client is None
+
+async def test_fetch_from_api_caches_responses(mock_httpx_client, mock_article):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
+    await get_latest_articles()
+    await get_latest_articles()
+    assert mock_httpx_client.get.call_count == 1
+
+async def test_fetch_from_api_serves_stale_on_error(mock_httpx_client, mock_article):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
+    await get_top_articles()
+    server._CACHE["normal"].clear()
+    server._disk.clear()
+    mock_httpx_client.get.side_effect = httpx.ConnectError("offline")
+    result = await get_top_articles()
+    assert result[0]["title"] == "Test Article"
+
+async def test_fetch_from_api_does_not_serve_stale_on_4xx(mock_httpx_client, mock_response, mock_article):
+    mock_response.content = msgspec.json.encode([mock_article])
+    await get_top_articles()
+    server._CACHE["normal"].clear()
+    server._disk.clear()
+    not_found = Mock(status_code=404)
+    not_found.raise_for_status.side_effect = httpx.HTTPStatusError("404", request=Mock(), response=not_found)
+    mock_httpx_client.get.return_value = not_found
+    with pytest.raises(httpx.HTTPStatusError):
+        await get_top_articles()
+
+async def test_fetch_from_api_shares_concurrent_misses(mock_httpx_client, mock_response, mock_article):
+    mock_response.content = msgspec.json.encode([mock_article])
+
+    async def slow_get(*args, **kwargs):
+        await asyncio.sleep(0.01)
+        return mock_response
+
+    mock_httpx_client.get.side_effect = slow_get
+    first, second = await asyncio.gather(get_top_articles(), get_top_articles())
+    assert first == second
+    assert mock_httpx_client.get.call_count == 1
+
+async def test_fetch_from_api_keys_on_decoded_type(mock_httpx_client, mock_article):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
+    articles = await server.fetch_from_api("/articles", decoder=server._ARTICLES_DECODER)
+    raw = await server.fetch_from_api("/articles")
+    assert isinstance(articles[0], server.Article)
+    assert isinstance(raw[0], dict)
+
+async def test_update_article_invalidates_cached_article(mock_httpx_client, mock_article, api_key):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode(mock_article)
+    mock_httpx_client.put.return_value.content = msgspec.json.encode({"url": "https://dev.to/test/123"})
+    await get_article_by_id("123")
+    await update_article(123, title="New Title")
+    await get_article_by_id("123")
+    assert mock_httpx_client.get.call_count == 2
+
+async def test_update_article_skips_prefetch(mock_httpx_client, api_key):
+    mock_httpx_client.put.return_value.content = msgspec.json.encode({"url": "https://dev.to/test/123"})
+    result = await update_article(123, title="New Title")
+    assert "https://dev.to/test/123" in result
+    mock_httpx_client.get.assert_not_called()
+    assert mock_httpx_client.put.call_args.kwargs["json"] == {"article": {"title": "New Title"}}
+
+async def test_update_article_sends_api_key(mock_httpx_client, api_key):
+    mock_httpx_client.put.return_value.content = msgspec.json.encode({"url": "https://dev.to/test/123"})
+    await update_article(123, body_markdown="Updated")
+    headers = mock_httpx_client.put.call_args.kwargs["headers"]
+    assert headers["api-key"] == api_key
+    assert headers["Content-Type"] == "application/json"
+
+async def test_create_article(mock_httpx_client, api_key):
+    mock_httpx_client.post.return_value.content = msgspec.json.encode({"id": 123, "url": "https://dev.to/test/123"})
+    result = await create_article("Title", "Body")
+    assert "123" in result
+    assert mock_httpx_client.post.call_args.kwargs["headers"]["api-key"] == api_key
+
+async def test_create_article_without_api_key(mock_httpx_client, monkeypatch):
+    monkeypatch.setattr(server, "API_KEY", None)
+    result = await create_article("Title", "Body")
+    assert "DEV_TO_API_KEY" in result
+    mock_httpx_client.post.assert_not_called()
+
+async def test_send_request_retries_after_429(mock_httpx_client, mock_response, mock_article):
+    limited = Mock(status_code=429, headers={"Retry-After": "0"})
+    mock_response.content = msgspec.json.encode([mock_article])
+    mock_httpx_client.get.side_effect = [limited, mock_response]
+    result = await get_top_articles()
+    assert result[0]["title"] == "Test Article"
+    assert mock_httpx_client.get.call_count == 2
+
+async def test_send_request_gives_up_on_long_retry_after(mock_httpx_client):
+    limited = Mock(status_code=429, headers={"Retry-After": "3600"})
+    limited.raise_for_status.side_effect = httpx.HTTPStatusError("429", request=Mock(), response=limited)
+    mock_httpx_client.get.return_value = limited
+    with pytest.raises(httpx.HTTPStatusError):
+        await get_top_articles()
+    assert mock_httpx_client.get.call_count == 1
+
+async def test_fetch_from_api_reads_disk_cache_after_restart(mock_httpx_client, mock_article):
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
+    await get_top_articles()
+    # Simulate a restart: memory caches are gone, the disk cache survives
+    for cache in server._CACHE.values():
+        cache.clear()
+    server._STALE.clear()
+    result = await get_top_articles()
+    assert result[0]["title"] == "Test Article"
+    assert mock_httpx_client.get.call_count == 1
+
+def test_get_disk_cache_creates_private_directory(monkeypatch, tmp_path):
+    cache_dir = tmp_path / "devto-mcp"
+    monkeypatch.setattr(server, "CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(server, "_disk", None)
+    try:
+        server.get_disk_cache()
+        assert cache_dir.stat().st_mode & 0o777 == 0o700
+    finally:
+        server.close_disk_cache()
+
+async def test_fetch_from_api_works_without_disk_cache(mock_httpx_client, mock_article, monkeypatch, tmp_path):
+    blocker = tmp_path / "not-a-dir"
+    blocker.write_text("")
+    monkeypatch.setattr(server, "CACHE_DIR", str(blocker / "devto-mcp"))
+    monkeypatch.setattr(server, "_disk", None)
+    monkeypatch.setattr(server, "_disk_disabled", False)
+    mock_httpx_client.get.return_value.content = msgspec.json.encode([mock_article])
+    result = await get_top_articles()
+    assert result[0]["title"] == "Test Article"
+    assert server._disk_disabled
+    with patch.object(server.os, "makedirs") as makedirs:
+        await get_latest_articles()
+    makedirs.assert_not_called()